@@ -179,8 +179,7 @@ class AppendedArgument(Unresolved):
                     value = packing._need_bytes(value)
                 if isinstance(value, (bytes, bytearray)):
                     value += b'\x00'
-                    while len(value) % context.bytes:
-                        value += b'$'
+                    value += b'$' * (-len(value) % context.bytes)
 
                     rv[i] = value
                 elif isinstance(value, Unresolved):
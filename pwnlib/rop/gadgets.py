@@ -4,39 +4,54 @@ import six
 class Gadget(object):
     """
     Describes a ROP gadget
+
+    >>> g = Gadget(0x1000, ['pop eax', 'ret'], ['eax'], 8)
+    >>> g['details'] = 'extra'
+    >>> g[1]
+    'extra'
+    >>> import pickle
+    >>> copy = pickle.loads(pickle.dumps(g, 0))
+    >>> copy, copy['details']
+    (Gadget(0x1000, ['pop eax', 'ret'], ['eax'], 0x8), 'extra')
     """
 
-    #: Address of the first instruction of the gadget
-    address = 0
-
-    #: List of disassembled instruction mnemonics
-    #:
-    #: Examples:
-    #:      ['pop eax', 'ret']
-    insns = []
-
-    #: OrderedDict of register to:
-    #:
-    #: - Offset from the top of the frame at which it's set
-    #: - Name of the register which it is set from
-    #:
-    #: Order is determined by the order of instructions.
-    #:
-    #: Examples:
-    #:
-    #: ret => {}
-    #: pop eax; ret => {'eax': 0}
-    #: pop ebx; pop eax; ret => {'ebx': 0, 'eax': 4}
-    #: add esp, 0x10; pop ebx; ret => {'ebx': 16}
-    #: mov eax, ebx; ret => {'eax': 'ebx'}
-    regs = {}
-
-    #: The total amount that the stack pointer is modified by
-    #:
-    #: Examples:
-    #:      ret ==> 4
-    #:      add esp, 0x10; ret ==> 0x14
-    move = 0
+    # A ROP object may hold tens of thousands of these, so the fields are
+    # stored in slots rather than a per-instance __dict__.
+    __slots__ = {
+        'address': """Address of the first instruction of the gadget""",
+
+        'insns': """List of disassembled instruction mnemonics
+
+        Examples:
+             ['pop eax', 'ret']
+        """,
+
+        'regs': """OrderedDict of register to:
+
+        - Offset from the top of the frame at which it's set
+        - Name of the register which it is set from
+
+        Order is determined by the order of instructions.
+
+        Examples:
+
+        ret => {}
+        pop eax; ret => {'eax': 0}
+        pop ebx; pop eax; ret => {'ebx': 0, 'eax': 4}
+        add esp, 0x10; pop ebx; ret => {'ebx': 16}
+        mov eax, ebx; ret => {'eax': 'ebx'}
+        """,
+
+        'move': """The total amount that the stack pointer is modified by
+
+        Examples:
+             ret ==> 4
+             add esp, 0x10; ret ==> 0x14
+        """,
+
+        'details': """Free-form data attached through ``gadget['details']``,
+        kept for backward compatibility""",
+    }
 
     def __init__(self, address, insns, regs, move):
         self.address = address
@@ -46,6 +61,14 @@ class Gadget(object):
 
     __indices = ['address', 'details']
 
+    # Slotted classes only pickle with protocol 2 and newer by default
+    def __getstate__(self):
+        return {k: getattr(self, k) for k in self.__slots__ if hasattr(self, k)}
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            setattr(self, k, v)
+
     def __repr__(self):
         return "%s(%#x, %r, %r, %#x)" % (self.__class__.__name__,
                                          self.address,
@@ -332,11 +332,13 @@ Let's try it out!
 from __future__ import absolute_import
 from __future__ import division
 
+import bisect
 import collections
 import copy
 import hashlib
 import itertools
 import os
+import pickle
 import re
 import shutil
 import six
@@ -377,6 +379,61 @@ except ImportError:
 else:
     enums += Enum,
 
+#: Name of the gadget cache directory inside :attr:`.context.cache_dir`.
+#: Bump the version whenever the on-disk format changes, and add the old
+#: name to :data:`_LEGACY_CACHE_DIRNAMES`.
+_CACHE_DIRNAME = 'rop-cache-v2'
+
+#: Gadget cache directories written by older versions, which are only
+#: removed by :meth:`ROP.clear_cache`.
+_LEGACY_CACHE_DIRNAMES = ('rop-cache',)
+
+#: Gadgets which ROP.__getattr__ looks up by the name of their first instruction
+_SYSCALL_GADGETS = {'int80': 'int 0x80',
+                    'syscall': 'syscall',
+                    'sysenter': 'sysenter'}
+
+_GadgetTuple = collections.namedtuple('gadget', ['address', 'details'])
+
+#
+# We accept only instructions that look like these.
+#
+# - leave
+# - pop reg
+# - add $sp, <hexadecimal value>
+# - ret
+# - int 0x80, syscall, sysenter
+#
+# Currently, ROPgadget does not detect multi-byte "C2" ret.
+# https://github.com/JonathanSalwan/ROPgadget/issues/53
+#
+# Everything is folded into a single alternation, so that each instruction
+# is matched exactly once.  The resulting match object tells us what kind
+# of instruction it was via ``lastindex``.
+#
+# Raw gadgets from ROPgadget (e.g. ``'pop eax ; ret'``) are validated as a
+# whole with _GADGET_TEXT_RE, so that the vast majority which contain some
+# other instruction are rejected without being split up first.
+#
+# >>> bool(_GADGET_RE.match('pop eax'))
+# True
+# >>> bool(_GADGET_RE.match('add rax, 0x24'))
+# False
+# >>> _GADGET_RE.match('add esp, 0x24').lastindex
+# 2
+# >>> bool(_GADGET_RE.match('add esp, esi'))
+# False
+# >>> bool(_GADGET_TEXT_RE.match('pop eax ; pop ebx ; ret'))
+# True
+# >>> bool(_GADGET_TEXT_RE.match('pop eax ; mov ebx, eax ; ret'))
+# False
+#
+_INSN_PATTERN = (r'(?:pop ([^ ]{2,3})'
+                 r'|add [er]sp, ((?:0[xX])?[0-9a-fA-F]+)'
+                 r'|ret|leave|int +0x80|syscall|sysenter)')
+_GADGET_RE = re.compile(r'^%s$' % _INSN_PATTERN)
+_GADGET_TEXT_RE = re.compile(r'^\s*%s\s*(?:;\s*%s\s*)*$' % (_INSN_PATTERN, _INSN_PATTERN))
+
 class Padding(object):
     """
     Placeholder for exactly one pointer-width of padding.
@@ -387,6 +444,8 @@ class Padding(object):
 def _slot_len(x):
     if isinstance(x, six.integer_types+(Unresolved, Padding, Gadget)):
         return context.bytes
+    elif isinstance(x, bytes):
+        return len(x)
     else:
         return len(packing.flat(x))
 
@@ -560,8 +619,8 @@ class ROP(object):
         'download',             # frequent typo
         'upload',               # frequent typo
     ]
-    X86_SUFFIXES = ['ax', 'bx', 'cx', 'dx', 'bp', 'sp', 'di', 'si',
-                    'r8', 'r9', '10', '11', '12', '13', '14', '15']
+    X86_SUFFIXES = frozenset(['ax', 'bx', 'cx', 'dx', 'bp', 'sp', 'di', 'si',
+                              'r8', 'r9', '10', '11', '12', '13', '14', '15'])
 
     def __init__(self, elfs, base = None, badchars = b'', **kwargs):
         """
@@ -595,7 +654,27 @@ class ROP(object):
         #: Characters which should not appear in ROP gadget addresses.
         self._badchars = set(badchars)
 
-        self.__load()
+        #: Mapping of ``{address: symbol name}`` over :attr:`elfs` while
+        #: :meth:`build` runs, or :const:`None` outside of it.  The first
+        #: ELF to define an address wins.
+        self._addr_to_name = None
+
+        #: Whether the gadgets have been mined from :attr:`elfs` yet.
+        #: Running ROPgadget is by far the most expensive part of creating
+        #: a ROP object, so it is deferred until a gadget is first needed.
+        self._gadgets_loaded = False
+
+        #: Context in which the gadgets are loaded, i.e. the one this ROP
+        #: object was created in.
+        self._load_context = dict(arch=context.arch, bits=context.bits, endian=context.endian)
+
+        #: Base address of each of :attr:`elfs` when this ROP object was
+        #: created.  Gadget addresses are relative to these, so rebasing an
+        #: ELF afterwards does not depend on whether gadgets were loaded yet.
+        self._load_bases = [elf.address for elf in elfs]
+
+        #: Results of :meth:`__getattr__` which are safe to reuse, keyed by name
+        self._attr_cache = {}
 
     @staticmethod
     @LocalContext
@@ -639,7 +718,7 @@ class ROP(object):
             if gadget.insns[-1] != 'ret':
                 continue
             # Do not use gadgets which contain 'syscall' or 'int'
-            if set(gadget.insns) & bad_instructions:
+            if not bad_instructions.isdisjoint(gadget.insns):
                 continue
 
             touched = tuple(regset & set(gadget.regs))
@@ -682,20 +761,21 @@ class ROP(object):
 
         # We have our set of "winner" gadgets, let's build a stack!
         stack = []
+        ptrsize = context.bytes
 
         for gadget in winner:
-            moved = context.bytes # Account for the gadget itself
+            moved = ptrsize # Account for the gadget itself
             goodregs = set(gadget.regs) & regset
             name = ",".join(goodregs)
             stack.append((gadget.address, gadget))
             for r in gadget.regs:
-                moved += context.bytes
+                moved += ptrsize
                 if r in registers:
                     stack.append((registers[r], r))
                 else:
                     stack.append((Padding('<pad %s>' % r), r))
 
-            for slot in range(moved, gadget.move, context.bytes):
+            for slot in range(moved, gadget.move, ptrsize):
                 left = gadget.move - slot
                 stack.append((Padding('<pad %#x>' % left), 'stack padding'))
 
@@ -749,6 +829,20 @@ class ROP(object):
 
         Returns:
             int containing address of 'resolvable', or None
+
+        >>> context.clear(arch='i386')
+        >>> e = ELF.from_assembly('ret')
+        >>> e.symbols['foo'] = 0x10001000
+        >>> r = ROP(e)
+        >>> hex(r.resolve('foo'))
+        '0x10001000'
+        >>> r.resolve('bar') is None
+        True
+        >>> r.resolve(0x1234) == 0x1234
+        True
+        >>> e.symbols['foo'] = 0x4242
+        >>> hex(r.resolve('foo'))
+        '0x4242'
         """
         if isinstance(resolvable, str):
             for elf in self.elfs:
@@ -758,6 +852,14 @@ class ROP(object):
         if isinstance(resolvable, six.integer_types):
             return resolvable
 
+    def __symbol_index(self):
+        """Returns a mapping of ``{address: symbol name}`` over :attr:`elfs`"""
+        addr_to_name = {}
+        for elf in self.elfs:
+            for name, addr in elf.symbols.items():
+                addr_to_name.setdefault(addr, name)
+        return addr_to_name
+
     def unresolve(self, value):
         """Inverts 'resolve'.  Given an address, it attempts to find a symbol
         for it in the loaded ELF files.  If none is found, it searches all
@@ -769,11 +871,33 @@ class ROP(object):
         Returns:
             String containing the symbol name for the address, disassembly for a gadget
             (if there's one at that address), or an empty string.
+
+        >>> context.clear(arch='i386')
+        >>> e = ELF.from_assembly('pop eax; ret')
+        >>> e.symbols['foo'] = 0x10001000
+        >>> r = ROP(e)
+        >>> r.unresolve(0x10001000)
+        'foo'
+        >>> r.unresolve(0x10000001)
+        'ret'
+        >>> e.address += 0x1000
+        >>> r.unresolve(0x10002000)
+        'foo'
+        >>> e.symbols['foo'] = 0x4242
+        >>> r.unresolve(0x4242)
+        'foo'
+        >>> r.unresolve(0x10002000)
+        ''
         """
-        for elf in self.elfs:
-            for name, addr in elf.symbols.items():
-                if addr == value:
-                    return name
+        if self._addr_to_name is not None:
+            name = self._addr_to_name.get(value)
+            if name is not None:
+                return name
+        else:
+            for elf in self.elfs:
+                for name, addr in elf.symbols.items():
+                    if addr == value:
+                        return name
 
         if value in self.gadgets:
             return '; '.join(self.gadgets[value].insns)
@@ -828,28 +952,62 @@ class ROP(object):
                 Optional output argument, which will gets a mapping of
                 ``address: description`` for each address on the stack,
                 starting at ``base``.
+
+        Every slot is described through :meth:`unresolve`, so the symbols
+        are indexed by address once per build rather than scanned per slot.
+
+        >>> context.clear(arch='i386')
+        >>> e = ELF.from_assembly('ret')
+        >>> class CountingSymbols(type(e.symbols)):
+        ...     scans = 0
+        ...     def items(self):
+        ...         CountingSymbols.scans += 1
+        ...         return super(CountingSymbols, self).items()
+        >>> e.symbols = CountingSymbols(e.symbols)
+        >>> e.symbols.update(('sym%d' % i, 0x20000000 + i) for i in range(10000))
+        >>> r = ROP(e)
+        >>> for i in range(100):
+        ...     r.raw(0x20000000 + i)
+        >>> 'sym99' in r.dump()
+        True
+        >>> CountingSymbols.scans
+        1
         """
         if base is None:
             base = self.base or 0
 
         stack = DescriptiveStack(base)
+
+        # Symbols may change between builds, but not during one.
+        outer = self._addr_to_name
+        self._addr_to_name = self.__symbol_index()
+        try:
+            self._build_first_pass(stack)
+            self._build_second_pass(stack, base)
+        finally:
+            self._addr_to_name = outer
+
+        return stack
+
+    def _build_first_pass(self, stack):
+        """
+        Get everything onto the stack and save as much descriptive information
+        as possible.
+
+        The only replacements performed are to add stack adjustment gadgets
+        (to move SP to the next gadget after a Call) and NextGadgetAddress,
+        which can only be calculated in this pass.
+        """
         chain = self._chain
 
-        #
-        # First pass
-        #
-        # Get everything onto the stack and save as much descriptive information
-        # as possible.
-        #
-        # The only replacements performed are to add stack adjustment gadgets
-        # (to move SP to the next gadget after a Call) and NextGadgetAddress,
-        # which can only be calculated in this pass.
-        #
+        # context.bytes goes through the thread-local context stack on every
+        # access; it cannot change while building, so look it up once.
+        ptrsize = context.bytes
+
         iterable = enumerate(chain)
         for idx, slot in iterable:
 
             remaining = len(chain) - 1 - idx
-            address   = stack.next
 
             # Integers can just be added.
             # Do our best to find out what the address is.
@@ -865,7 +1023,7 @@ class ROP(object):
                 if not isinstance(slot, bytes):
                     slot = slot.encode()
 
-                for chunk in lists.group(context.bytes, slot):
+                for chunk in lists.group(ptrsize, slot):
                     stack.append(chunk)
 
             elif isinstance(slot, srop.SigreturnFrame):
@@ -885,91 +1043,107 @@ class ROP(object):
                     stack.append(value)
 
             elif isinstance(slot, Call):
-                stack.describe(self.describe(slot))
+                self._build_call(stack, slot, remaining, ptrsize)
 
-                registers    = slot.register_arguments
-
-                for value, name in self.setRegisters(registers):
-                    if name in registers:
-                        index = slot.abi.register_arguments.index(name)
-                        description = self.describe(value) or repr(value)
-                        stack.describe('[arg%d] %s = %s' % (index, name, description))
-                    elif isinstance(name, Gadget):
-                        stack.describe('; '.join(name.insns))
-                    elif isinstance(name, str):
-                        stack.describe(name)
-                    stack.append(value)
+            else:
+                stack.append(slot)
 
-                if address != stack.next:
-                    stack.describe(slot.name)
+    def _build_call(self, stack, slot, remaining, ptrsize):
+        """
+        Put a :class:`.Call` onto the stack: register loading, the call target
+        itself, and any stack arguments (with a stack adjustment if more of
+        the chain follows).
+        """
+        address = stack.next
 
-                stack.append(slot.target)
+        stack.describe(self.describe(slot))
 
-                # For any remaining arguments, put them on the stack
-                stackArguments = slot.stack_arguments
-                for argument in slot.stack_arguments_before:
-                    stack.describe("[dlresolve index]")
-                    stack.append(argument)
-                nextGadgetAddr = stack.next + (context.bytes * len(stackArguments))
+        registers    = slot.register_arguments
 
-                # Generally, stack-based arguments assume there's a return
-                # address on the stack.
-                #
-                # We need to at least put padding there so that things line up
-                # properly, but likely also need to adjust the stack past the
-                # arguments.
-                if slot.abi.returns:
+        for value, name in self.setRegisters(registers):
+            if name in registers:
+                index = slot.abi.register_arguments.index(name)
+                description = self.describe(value) or repr(value)
+                stack.describe('[arg%d] %s = %s' % (index, name, description))
+            elif isinstance(name, Gadget):
+                stack.describe('; '.join(name.insns))
+            elif isinstance(name, str):
+                stack.describe(name)
+            stack.append(value)
 
-                    # Save off the address of the next gadget
-                    if remaining or stackArguments:
-                        nextGadgetAddr = stack.next
+        if address != stack.next:
+            stack.describe(slot.name)
 
-                    # If there were arguments on the stack, we need to stick something
-                    # in the slot where the return address goes.
-                    if len(stackArguments) > 0:
-                        if remaining:
-                            fix_size  = (1 + len(stackArguments))
-                            fix_bytes = fix_size * context.bytes
-                            adjust   = self.search(move = fix_bytes)
+        stack.append(slot.target)
 
-                            if not adjust:
-                                log.error("Could not find gadget to adjust stack by %#x bytes" % fix_bytes)
+        # For any remaining arguments, put them on the stack
+        stackArguments = slot.stack_arguments
+        for argument in slot.stack_arguments_before:
+            stack.describe("[dlresolve index]")
+            stack.append(argument)
+        nextGadgetAddr = stack.next + (ptrsize * len(stackArguments))
 
-                            nextGadgetAddr += adjust.move
+        # Generally, stack-based arguments assume there's a return
+        # address on the stack.
+        #
+        # We need to at least put padding there so that things line up
+        # properly, but likely also need to adjust the stack past the
+        # arguments.
+        if slot.abi.returns:
 
-                            stack.describe('<adjust @%#x> %s' % (nextGadgetAddr, self.describe(adjust)))
-                            stack.append(adjust.address)
+            # Save off the address of the next gadget
+            if remaining or stackArguments:
+                nextGadgetAddr = stack.next
 
-                            for pad in range(fix_bytes, adjust.move, context.bytes):
-                                stackArguments.append(Padding())
+            # If there were arguments on the stack, we need to stick something
+            # in the slot where the return address goes.
+            if len(stackArguments) > 0:
+                if remaining:
+                    fix_size  = (1 + len(stackArguments))
+                    fix_bytes = fix_size * ptrsize
+                    adjust   = self.search(move = fix_bytes)
 
-                        # We could not find a proper "adjust" gadget, but also didn't need one.
-                        else:
-                            stack.append(Padding("<return address>"))
+                    if not adjust:
+                        log.error("Could not find gadget to adjust stack by %#x bytes" % fix_bytes)
 
+                    nextGadgetAddr += adjust.move
 
-                for i, argument in enumerate(stackArguments):
+                    stack.describe('<adjust @%#x> %s' % (nextGadgetAddr, self.describe(adjust)))
+                    stack.append(adjust.address)
 
-                    if isinstance(argument, NextGadgetAddress):
-                        stack.describe("<next gadget>")
-                        stack.append(nextGadgetAddr)
+                    for pad in range(fix_bytes, adjust.move, ptrsize):
+                        stackArguments.append(Padding())
+
+                # We could not find a proper "adjust" gadget, but also didn't need one.
+                else:
+                    stack.append(Padding("<return address>"))
+
+
+        for i, argument in enumerate(stackArguments):
+
+            if isinstance(argument, NextGadgetAddress):
+                stack.describe("<next gadget>")
+                stack.append(nextGadgetAddr)
 
-                    else:
-                        description = self.describe(argument) or 'arg%i' % (i + len(registers))
-                        stack.describe(description)
-                        stack.append(argument)
             else:
-                stack.append(slot)
-        #
-        # Second pass
-        #
-        # All of the register-loading, stack arguments, and call addresses
-        # are on the stack.  We can now start loading in absolute addresses.
-        #
-        start = base
-        end   = stack.next
-        size  = (stack.next - base)
+                description = self.describe(argument) or 'arg%i' % (i + len(registers))
+                stack.describe(description)
+                stack.append(argument)
+
+    def _build_second_pass(self, stack, base):
+        """
+        All of the register-loading, stack arguments, and call addresses
+        are on the stack.  We can now start loading in absolute addresses.
+        """
+        ptrsize      = context.bytes
         slot_address = base
+
+        # Padding is a slice of one cyclic pattern reaching the last Padding
+        # slot, rather than a fresh cyclic() call (of ever-growing length)
+        # per slot.  Going further could exceed what a restricted alphabet
+        # can produce.
+        padding = b''
+
         for i, slot in enumerate(stack):
             if isinstance(slot, six.integer_types):
                 pass
@@ -985,7 +1159,11 @@ class ROP(object):
                 stack[i] = slot_address
 
             elif isinstance(slot, Padding):
-                stack[i] = self.generatePadding(i * context.bytes, context.bytes)
+                offset = i * ptrsize
+                if len(padding) < offset + ptrsize:
+                    last = max(j for j in range(i, len(stack)) if isinstance(stack[j], Padding))
+                    padding = self.generatePadding(0, (last + 1) * ptrsize)
+                stack[i] = padding[offset:offset + ptrsize]
                 stack.describe(slot.name, slot_address)
 
             elif isinstance(slot, Gadget):
@@ -1000,9 +1178,6 @@ class ROP(object):
 
             slot_address += _slot_len(slot)
 
-        return stack
-
-
     def find_stack_adjustment(self, slots):
         self.search(move=slots * context.bytes)
 
@@ -1016,8 +1191,32 @@ class ROP(object):
 
         Returns:
             str containing raw ROP bytes
+
+        >>> context.clear(arch='i386')
+        >>> rop = ROP([])
+        >>> rop.raw(0xdeadbeef)
+        >>> rop.raw(b'XXXX')
+        >>> rop.raw(-1)
+        >>> rop.chain()
+        b'\\xef\\xbe\\xad\\xdeXXXX\\xff\\xff\\xff\\xff'
         """
-        return packing.flat(self.build(base=base))
+        stack = self.build(base=base)
+
+        # Most of the stack is addresses and other small integers.  Pack
+        # those with a specialized packer instead of letting flat() go
+        # through the generic pack() for every slot.
+        packer = packing.make_packer(sign='unsigned')
+        limit  = 1 << context.bits
+        stack  = [packer(x) if isinstance(x, six.integer_types) and 0 <= x < limit else x
+                  for x in stack]
+
+        # Usually that leaves nothing but bytes, which a single join sizes
+        # and copies in one go.  flat() would also advance its filler once
+        # per output byte, which is pointless with nothing to fill.
+        if all(isinstance(x, bytes) for x in stack):
+            return b''.join(stack)
+
+        return packing.flat(stack)
 
     def dump(self, base=None):
         """Dump the ROP chain in an easy-to-read manner
@@ -1189,7 +1388,7 @@ class ROP(object):
 
     def __get_cachefile_name(self, files):
         """Given an ELF or list of ELF objects, return a cache file for the set of files"""
-        cachedir = os.path.join(context.cache_dir, 'rop-cache')
+        cachedir = os.path.join(context.cache_dir, _CACHE_DIRNAME)
         if not os.path.exists(cachedir):
             os.mkdir(cachedir)
 
@@ -1204,59 +1403,42 @@ class ROP(object):
 
     @staticmethod
     def clear_cache():
-        """Clears the ROP gadget cache"""
-        cachedir = os.path.join(context.cache_dir, 'rop-cache')
+        """Clears the ROP gadget cache
+
+        This also removes the caches left behind by older versions.
+
+        >>> legacy = os.path.join(context.cache_dir, 'rop-cache')
+        >>> if not os.path.isdir(legacy):
+        ...     os.makedirs(legacy)
+        >>> ROP.clear_cache()
+        >>> os.path.exists(legacy)
+        False
+        """
+        for dirname in _LEGACY_CACHE_DIRNAMES:
+            shutil.rmtree(os.path.join(context.cache_dir, dirname), ignore_errors=True)
+        cachedir = os.path.join(context.cache_dir, _CACHE_DIRNAME)
         shutil.rmtree(cachedir)
 
-    def __cache_load(self, elf):
-        filename = self.__get_cachefile_name(elf)
+    def __cache_load(self, elf, base, filename):
         if not os.path.exists(filename):
             return None
-        gadgets = eval(open(filename).read())
-        gadgets = {k - elf.load_addr + elf.address:v for k, v in gadgets.items()}
+        try:
+            with open(filename, 'rb') as fd:
+                gadgets = pickle.load(fd)
+        except Exception as e:
+            log.debug('Ignoring corrupt gadget cache %r: %s', filename, e)
+            return None
+        gadgets = {k - elf.load_addr + base:v for k, v in gadgets.items()}
         log.info_once('Loaded %s cached gadgets for %r', len(gadgets), elf.file.name)
         return gadgets
 
-    def __cache_save(self, elf, data):
-        data = {k + elf.load_addr - elf.address:v for k, v in data.items()}
-        open(self.__get_cachefile_name(elf), 'w+').write(repr(data))
+    def __cache_save(self, elf, base, filename, data):
+        data = {k + elf.load_addr - base:v for k, v in data.items()}
+        with open(filename, 'wb') as fd:
+            pickle.dump(data, fd, protocol=2)
 
     def __load(self):
         """Load all ROP gadgets for the selected ELF files"""
-        #
-        # We accept only instructions that look like these.
-        #
-        # - leave
-        # - pop reg
-        # - add $sp, <hexadecimal value>
-        # - ret
-        #
-        # Currently, ROPgadget does not detect multi-byte "C2" ret.
-        # https://github.com/JonathanSalwan/ROPgadget/issues/53
-        #
-
-        pop   = re.compile(r'^pop (.{2,3})')
-        add   = re.compile(r'^add [er]sp, ((?:0[xX])?[0-9a-fA-F]+)$')
-        ret   = re.compile(r'^ret$')
-        leave = re.compile(r'^leave$')
-        int80 = re.compile(r'int +0x80')
-        syscall = re.compile(r'^syscall$')
-        sysenter = re.compile(r'^sysenter$')
-
-        #
-        # Validation routine
-        #
-        # >>> valid('pop eax')
-        # True
-        # >>> valid('add rax, 0x24')
-        # False
-        # >>> valid('add esp, 0x24')
-        # True
-        # >>> valid('add esp, esi')
-        # False
-        #
-        valid = lambda insn: any(map(lambda pattern: pattern.match(insn), [pop,add,ret,leave,int80,syscall,sysenter]))
-
         #
         # Currently, ropgadget.args.Args() doesn't take any arguments, and pulls
         # only from sys.argv.  Preserve it through this call.  We also
@@ -1277,8 +1459,9 @@ class ROP(object):
                 return self._fd.__getattribute__(k)
 
         gadgets = {}
-        for elf in self.elfs:
-            cache = self.__cache_load(elf)
+        for elf, base in zip(self.elfs, self._load_bases):
+            cachefile = self.__get_cachefile_name(elf)
+            cache = self.__cache_load(elf, base, cachefile)
             if cache:
                 gadgets.update(cache)
                 continue
@@ -1295,44 +1478,57 @@ class ROP(object):
                 sys.argv = argv
                 sys.stdout = stdout
 
+            # Nearly all gadgets are made of the same few instructions ('ret',
+            # 'pop rdi', ...).  Share a single string object per distinct
+            # instruction, which keeps the loaded gadgets small and lets
+            # pickle store each instruction only once in the cache file.
+            insns_seen = {}
+
             elf_gadgets = {}
             for gadget in core._Core__gadgets:
-                address = gadget['vaddr'] - elf.load_addr + elf.address
+                if not _GADGET_TEXT_RE.match(gadget['gadget']):
+                    continue
+                address = gadget['vaddr'] - elf.load_addr + base
                 insns = [ g.strip() for g in gadget['gadget'].split(';') ]
-                if all(map(valid, insns)):
-                    elf_gadgets[address] = insns
+                elf_gadgets[address] = [ insns_seen.setdefault(i, i) for i in insns ]
 
-            self.__cache_save(elf, elf_gadgets)
+            self.__cache_save(elf, base, cachefile, elf_gadgets)
             gadgets.update(elf_gadgets)
 
         #
         # For each gadget we decided to keep, find out how much it moves the stack,
         # and log which registers it modifies.
         #
-        self.gadgets = {}
-        self.pivots = {}
+        self._gadgets = {}
+        self._pivots = {}
+        ptrsize = context.bytes
         frame_regs = {
             4: ['ebp', 'esp'],
             8: ['rbp', 'rsp']
-        }[context.bytes]
+        }[ptrsize]
+
+        packer = packing.make_packer(sign='unsigned')
 
         for addr, insns in gadgets.items():
 
             # Filter out gadgets by address against badchars
-            if set(pack(addr)) & self._badchars:
+            if self._badchars and set(packer(addr)) & self._badchars:
                 continue
 
             sp_move = 0
             regs = []
             for insn in insns:
-                if pop.match(insn):
-                    regs.append(pop.match(insn).group(1))
-                    sp_move += context.bytes
-                elif add.match(insn):
-                    sp_move += int(add.match(insn).group(1), 16)
-                elif ret.match(insn):
-                    sp_move += context.bytes
-                elif leave.match(insn):
+                match = _GADGET_RE.match(insn)
+                if match is None:
+                    continue
+                if match.lastindex == 1:
+                    regs.append(match.group(1))
+                    sp_move += ptrsize
+                elif match.lastindex == 2:
+                    sp_move += int(match.group(2), 16)
+                elif insn == 'ret':
+                    sp_move += ptrsize
+                elif insn == 'leave':
                     #
                     # HACK: Since this modifies ESP directly, this should
                     #       never be returned as a 'normal' ROP gadget that
@@ -1347,16 +1543,105 @@ class ROP(object):
 
             # Permit duplicates, because blacklisting bytes in the gadget
             # addresses may result in us needing the dupes.
-            self.gadgets[addr] = Gadget(addr, insns, regs, sp_move)
+            self._gadgets[addr] = Gadget(addr, insns, regs, sp_move)
 
             # Don't use 'pop esp' for pivots
             if not set(['rsp', 'esp']) & set(regs):
-                self.pivots[sp_move] = addr
+                self._pivots[sp_move] = addr
+
+        #
+        # Only gadgets ending in 'ret' are ever returned by search_iter().
+        # Keep their stack moves and register sets in parallel lists, so
+        # that searching does not rebuild a set() for every gadget.
+        #
+        self._ret_gadgets = [g for g in self._gadgets.values() if g.insns[-1] == 'ret']
+        self._ret_moves   = [g.move for g in self._ret_gadgets]
+        self._ret_regsets = [frozenset(g.regs) for g in self._ret_gadgets]
+
+        # Index of the above, by each register which the gadget pops
+        self._ret_by_reg = {}
+        for i, regset in enumerate(self._ret_regsets):
+            for reg in regset:
+                self._ret_by_reg.setdefault(reg, []).append(i)
+
+        #
+        # Keep the 'ret' gadgets sorted by the key used in search(order='size'),
+        # so that looking up a pure stack adjustment is a binary search instead
+        # of a scan over every gadget.
+        #
+        self._adjustments = sorted((g.move, len(g.regs), g.address)
+                                   for g in self._ret_gadgets)
 
         leave = self.search(regs=frame_regs, order='regs')
         if leave and leave.regs != frame_regs:
             leave = None
-        self.leave = leave
+        self._leave = leave
+
+    def __ensure_gadgets(self):
+        """Load the gadgets for :attr:`elfs`, unless that was already done"""
+        if self._gadgets_loaded:
+            return
+        self._gadgets_loaded = True
+        try:
+            with context.local(**self._load_context):
+                self.__load()
+        except AttributeError as e:
+            # Escaping a property as AttributeError would make Python retry
+            # the lookup through __getattr__, silently turning e.g.
+            # ``rop.gadgets`` into a call() shim.
+            self._gadgets_loaded = False
+            log.error('Could not load gadgets: %s', e)
+        except Exception:
+            self._gadgets_loaded = False
+            raise
+
+    @property
+    def gadgets(self):
+        """dict: Mapping of ``{address: Gadget}`` for all usable gadgets
+
+        Gadgets are loaded on first use, but their addresses are based on
+        where the ELFs were when the ROP object was created.
+
+        >>> context.clear(arch='i386')
+        >>> e = ELF.from_assembly('pop eax; ret')
+        >>> r = ROP(e)
+        >>> e.address += 0x100000
+        >>> sorted(hex(a) for a in r.gadgets)
+        ['0x10000000', '0x10000001']
+
+        The gadget cache is keyed on the contents of the ELF, so patching
+        it finds the new gadgets.
+
+        >>> e = ELF.from_assembly('pop eax; ret; nop; nop')
+        >>> sorted(hex(a) for a in ROP(e).gadgets)
+        ['0x10000000', '0x10000001']
+        >>> e.write(e.entry + 2, b'\\x5b\\xc3')
+        >>> e.save(e.path)
+        >>> sorted(hex(a) for a in ROP(e).gadgets)
+        ['0x10000000', '0x10000001', '0x10000002']
+
+        A corrupt cache file is ignored, and the gadgets are mined again.
+
+        >>> cachefile = os.path.join(context.cache_dir, 'rop-cache-v2', sha256sumhex(e.get_data()))
+        >>> with open(cachefile, 'wb') as fd:
+        ...     _ = fd.write(b'garbage')
+        >>> sorted(hex(a) for a in ROP(e).gadgets)
+        ['0x10000000', '0x10000001', '0x10000002']
+        """
+        self.__ensure_gadgets()
+        return self._gadgets
+
+    @property
+    def pivots(self):
+        """dict: Mapping of ``{stack adjustment: address}`` of gadgets which do not pop $sp"""
+        self.__ensure_gadgets()
+        return self._pivots
+
+    @property
+    def leave(self):
+        """:class:`.Gadget`: A ``leave; ret`` gadget, or :const:`None`"""
+        self.__ensure_gadgets()
+        return self._leave
 
     def __repr__(self):
         return 'ROP(%r)' % self.elfs
@@ -1367,16 +1652,28 @@ class ROP(object):
         *at least* ``move`` bytes, and which allow you to set all
         registers in ``regs``.
         """
+        self.__ensure_gadgets()
+
         move = move or 0
         regs = set(regs or ())
+        packer = packing.make_packer(sign='unsigned')
+        badchars = self._badchars
+
+        gadgets, moves, regsets = self._ret_gadgets, self._ret_moves, self._ret_regsets
+
+        # Only gadgets which pop the rarest of the requested registers can
+        # possibly match, so there is no need to look at any others.
+        if regs:
+            candidates = min((self._ret_by_reg.get(reg, ()) for reg in regs), key=len)
+        else:
+            candidates = range(len(gadgets))
 
-        for addr, gadget in self.gadgets.items():
-            addr_bytes = set(pack(gadget.address))
-            if addr_bytes & self._badchars:     continue
-            if gadget.insns[-1] != 'ret':        continue
-            if gadget.move < move:               continue
-            if not (regs <= set(gadget.regs)):   continue
-            yield gadget
+        for i in candidates:
+            if moves[i] < move:                  continue
+            if not (regs <= regsets[i]):         continue
+            if badchars and set(packer(gadgets[i].address)) & badchars:
+                continue
+            yield gadgets[i]
 
     def search(self, move = 0, regs = None, order = 'size'):
         """Search for a gadget which matches the specified criteria.
@@ -1399,6 +1696,20 @@ class ROP(object):
         Returns:
             A :class:`.Gadget` object
         """
+        self.__ensure_gadgets()
+
+        if not regs and order == 'size':
+            index = bisect.bisect_left(self._adjustments, (move or 0,))
+            if index == len(self._adjustments):
+                return None
+            result = self.gadgets[self._adjustments[index][2]]
+
+            # Check for magic 9999999... value used by 'leave; ret'
+            if move and result.move == 9999999999:
+                return None
+
+            return result
+
         matches = self.search_iter(move, regs)
         if matches is None:
             return None
@@ -1523,6 +1834,8 @@ class ROP(object):
         >>> rop=ROP([elf])
         >>> rop.rdi     == rop.search(regs=['rdi'], order = 'regs')
         True
+        >>> rop.rdi is rop.rdi
+        True
         >>> rop.r13_r14_r15_rbp == rop.search(regs=['r13','r14','r15','rbp'], order = 'regs')
         True
         >>> rop.ret_8   == rop.search(move=8)
@@ -1534,26 +1847,34 @@ class ROP(object):
         >>> r.syscall is not None
         True
         """
-        gadget = collections.namedtuple('gadget', ['address', 'details'])
-
         if attr in self.__dict__ \
         or attr in self.BAD_ATTRS \
         or attr.startswith('_'):
             raise AttributeError('ROP instance has no attribute %r' % attr)
 
+        #
+        # Attribute lookups are resolved the same way every time, so avoid
+        # re-parsing the name and re-searching the gadgets.
+        #
+        result = self._attr_cache.get(attr)
+        if result is not None:
+            return result
+
+        parts = attr.split('_')
+
         #
         # Check for 'ret' or 'ret_X'
         #
         if attr.startswith('ret'):
-            count = context.bytes
-            if '_' in attr:
-                count = int(attr.split('_')[1])
-            return self.search(move=count)
+            # A bare 'ret' depends on context.bytes, so it is not cached.
+            if len(parts) == 1:
+                return self.search(move=context.bytes)
+            result = self.search(move=int(parts[1]))
 
         #
         # Check for 'jmp_esp'('i386') or 'jmp_rsp'('amd64')
         #
-        if attr == 'jmp_esp' and context.arch == 'i386' \
+        elif attr == 'jmp_esp' and context.arch == 'i386' \
         or attr == 'jmp_rsp' and context.arch == 'amd64':
             jmp_sp = {'i386': 'jmp esp',
                       'amd64': 'jmp rsp'
@@ -1566,30 +1887,34 @@ class ROP(object):
                     if set(pack(addr)) & self._badchars:
                         continue
 
-                    return Gadget(addr, [jmp_sp], [], context.bytes)
-            return None
-        mapping = {'int80': 'int 0x80',
-            'syscall': 'syscall',
-            'sysenter': 'sysenter'}
-        if attr in mapping:
+                    result = Gadget(addr, [jmp_sp], [], context.bytes)
+                    break
+                if result is not None:
+                    break
+
+        elif attr in _SYSCALL_GADGETS:
             for each in self.gadgets:
-                if self.gadgets[each]['insns'][0] == mapping[attr]:
-                    return gadget(each, self.gadgets[each])
-            return None
+                if self.gadgets[each]['insns'][0] == _SYSCALL_GADGETS[attr]:
+                    result = _GadgetTuple(each, self.gadgets[each])
+                    break
 
         #
         # Check for a '_'-delimited list of registers
         #
-        if all(map(lambda x: x[-2:] in self.X86_SUFFIXES, attr.split('_'))):
-            return self.search(regs=attr.split('_'), order='regs')
+        elif all(part[-2:] in self.X86_SUFFIXES for part in parts):
+            result = self.search(regs=parts, order='regs')
 
         #
         # Otherwise, assume it's a rop.call() shorthand
         #
-        def call(*args):
-            return self.call(attr, args)
+        else:
+            def call(*args):
+                return self.call(attr, args)
+            result = call
 
-        return call
+        if result is not None:
+            self._attr_cache[attr] = result
+        return result
 
     def __setattr__(self, attr, value):
         """Helper for setting registers.
@@ -394,13 +394,13 @@ class SigreturnFrame(dict):
         return self[attr]
 
     def __bytes__(self):
-        frame = b""
+        frame = bytearray()
         with context.local(arch=self.arch):
             for register_offset in sorted(self.register_offsets):
                 if len(frame) < register_offset:
-                    frame += b"\x00"*(register_offset - len(frame))
-                frame += pack(self[self.registers[register_offset]])
-        return frame
+                    frame.extend(b"\x00"*(register_offset - len(frame)))
+                frame.extend(pack(self[self.registers[register_offset]]))
+        return bytes(frame)
 
     def __str__(self):
         return str(self.__bytes__())